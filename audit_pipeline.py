@@ -8,14 +8,50 @@ Real-time data from: CoinGecko API, Etherscan, X.AI Grok (via web search)
 Author: John DaWalka
 """
 
+import io
+import argparse
 import os
+import stat
+import shutil
+import signal
 import sys
 import json
+import logging
 import subprocess
-from datetime import datetime
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+import tempfile
+import threading
+import time
+import hashlib
+import functools
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+from dataclasses import asdict, dataclass
 from enum import Enum
+from pathlib import Path
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+    JSON_PARSE_ERRORS = (ValueError, ijson.JSONError)
+except ImportError:
+    IJSON_AVAILABLE = False
+    JSON_PARSE_ERRORS = (ValueError,)
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
 
 # CONFIGURATION & CONSTANTS
 
@@ -27,6 +63,10 @@ class AuditLevel(Enum):
     FORENSIC = "forensic"     # Everything + continuous monitoring
 
 
+# CLI value -> AuditLevel lookup
+_LEVELS = {level.value: level for level in AuditLevel}
+
+
 # API endpoints for live crypto data
 COINGECKO_API = "https://api.coingecko.com/api/v3"
 ETHERSCAN_API = "https://api.etherscan.io/api"
@@ -34,6 +74,76 @@ ETHERSCAN_API = "https://api.etherscan.io/api"
 SAG3_API = "https://api.sag3.ai"  # Placeholder - use actual endpoint when available
 
 
+# Severity buckets reported for every tool, most severe first
+SEVERITY_LEVELS = ("critical", "high", "medium", "low", "informational")
+
+
+# Top-level Slither report fields saying whether the analysis itself succeeded
+REPORT_STATUS_FIELDS = ("success", "error")
+
+
+# Detector fields kept from Slither reports; everything else is discarded
+FINDING_FIELDS = ("check", "impact", "confidence", "description")
+
+
+# Slither impact -> severity bucket. Slither has no critical impact, and
+# optimization suggestions are counted as informational.
+IMPACT_SEVERITY = {
+    "high": "high",
+    "medium": "medium",
+    "low": "low",
+    "informational": "informational",
+    "optimization": "informational",
+}
+
+
+# Slither subprocess limits
+SLITHER_TIMEOUT = 300          # seconds
+STREAM_CHUNK_SIZE = 64 * 1024  # bytes read per chunk when draining output
+
+
+# Raw byte markers for the QUICK-level pass/fail gate. If none of these occur
+# anywhere in a Slither report it cannot contain a high-impact finding. The
+# key is included so a "High" confidence value does not trip the gate.
+SEVERITY_GATE_MARKERS = (b'"impact": "High"', b'"impact":"High"')
+
+# Start of a report whose analysis succeeded; Slither writes "success" first
+REPORT_SUCCESS_PREFIXES = (b'{"success": true', b'{"success":true')
+
+
+# On-disk cache for third-party API responses
+CACHE_DIR = Path.home() / ".audit_pipeline"
+ETHERSCAN_CACHE_DIR = CACHE_DIR / "etherscan_cache"
+ETHERSCAN_CACHE_TTL = {
+    "txlist": 24 * 60 * 60,               # Only the oldest transaction is fetched
+    "getcontractcreation": 24 * 60 * 60,  # Deployer and creation tx are immutable
+    "getsourcecode": 24 * 60 * 60,        # Verification status is effectively immutable
+}
+COINGECKO_CACHE_DIR = CACHE_DIR / "coingecko_cache"
+COINGECKO_CACHE_TTL = 5 * 60  # Keeps well under the free tier's 10-50 calls/min
+
+
+def _build_session():
+    """
+    Shared HTTP session so API calls reuse keep-alive connections instead of
+    paying a TCP+TLS handshake per request. Transient errors and 429
+    rate-limit responses are retried with exponential backoff.
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504]
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_SESSION = _build_session() if REQUESTS_AVAILABLE else None
+
+
 # Tool paths and versions
 TOOLS_CONFIG = {
     "slither": {"min_version": "0.9.0", "installed": False},
@@ -43,15 +153,25 @@ TOOLS_CONFIG = {
     "mythx": {"min_version": "0.20.0", "installed": False},
 }
 
+# Command-line executable for each locally run tool
+TOOL_EXECUTABLES = {
+    "slither": "slither",
+    "mythril": "myth",
+    "echidna": "echidna",
+    "certora": "certoraRun",
+}
+
 
 @dataclass
 class AuditResult:
-    """Stores audit findings from a single tool"""
+    """Stores the audit summary from a single tool; findings live in a sidecar file"""
     tool_name: str
     severity_count: Dict[str, int]  # {"critical": 0, "high": 1, "medium": 3}
-    findings: List[Dict]
+    findings_count: Optional[int]  # None when the QUICK gate skipped counting
     execution_time: float
     passed: bool
+    findings_path: Optional[str] = None  # NDJSON file with one finding per line
+    gated: bool = False  # Passed by the QUICK gate without parsing the report
 
 
 @dataclass
@@ -65,7 +185,7 @@ class CryptoMetrics:
     contract_address: str
     deployer_address: str
     creation_date: str
-    transaction_count: int
+    transaction_count: Optional[int]  # None when the count is not available
 
 
 @dataclass
@@ -81,49 +201,356 @@ class RiskScore:
 
 # UTILITY FUNCTIONS
 
+# Custom level so success messages keep their own label
+SUCCESS = 25
+logging.addLevelName(SUCCESS, "SUCCESS")
+
+
+class _StampFormatter(logging.Formatter):
+    """Formatter that renders the timestamp once per second and reuses it"""
+    
+    def __init__(self, fmt: str, datefmt: str):
+        super().__init__(fmt, datefmt)
+        self._cached_stamp: Tuple[int, str] = (-1, "")
+    
+    def _stamp(self, created: float) -> str:
+        second = int(created)
+        # Read and replace the (second, text) pair as one tuple so the two
+        # handlers sharing this formatter never see a mismatched pair
+        cached_second, text = self._cached_stamp
+        if cached_second != second:
+            text = time.strftime(self.datefmt, self.converter(second))
+            self._cached_stamp = (second, text)
+        return text
+    
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        return self._stamp(record.created)
+
+
+class _StdStreamHandler(logging.StreamHandler):
+    """
+    StreamHandler that looks up sys.stdout/sys.stderr on every emit, like the
+    print() calls it replaced, so redirected or captured streams are honoured
+    """
+    
+    def __init__(self, stream_name: str):
+        self._stream_name = stream_name
+        super().__init__()
+    
+    @property
+    def stream(self):
+        return getattr(sys, self._stream_name)
+    
+    @stream.setter
+    def stream(self, value):
+        pass  # Always resolved from sys at emit time
+
+
+def _build_logger() -> logging.Logger:
+    """Configure the pipeline logger once: info/success to stdout, errors to stderr"""
+    logger = logging.getLogger("audit_pipeline")
+    if logger.handlers:
+        return logger
+    
+    formatter = _StampFormatter(
+        "[%(asctime)s] %(levelname)s: %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S"
+    )
+    
+    stdout_handler = _StdStreamHandler("stdout")
+    stdout_handler.addFilter(lambda record: record.levelno < logging.ERROR)
+    stdout_handler.setFormatter(formatter)
+    
+    stderr_handler = _StdStreamHandler("stderr")
+    stderr_handler.setLevel(logging.ERROR)
+    stderr_handler.setFormatter(formatter)
+    
+    logger.addHandler(stdout_handler)
+    logger.addHandler(stderr_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+
+_logger = _build_logger()
+
+
 class Logger:
     """Simple logging utility with timestamps"""
     
     @staticmethod
     def info(message: str):
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        print(f"[{timestamp}] INFO: {message}")
+        _logger.info(message)
     
     @staticmethod
     def error(message: str):
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        print(f"[{timestamp}] ERROR: {message}", file=sys.stderr)
+        _logger.error(message)
     
     @staticmethod
     def success(message: str):
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        print(f"[{timestamp}] SUCCESS: {message}")
+        _logger.log(SUCCESS, message)
 
 
-def check_tool_installed(tool_name: str) -> bool:
-    """Verify if a security tool is installed and accessible"""
+@functools.lru_cache(maxsize=None)
+def check_tool_installed(tool_name: str, strict: bool = False) -> bool:
+    """
+    Verify if a security tool is installed and accessible. By default this is
+    a PATH lookup; with strict the tool is launched with --version to prove it
+    actually runs. Answers are memoized for the process only: a release gate
+    must not trust a probe made before the tool was upgraded or removed.
+    """
+    executable = TOOL_EXECUTABLES.get(tool_name)
+    if executable is None:
+        return False
+    if not strict:
+        return shutil.which(executable) is not None
+    
     try:
-        if tool_name == "slither":
-            subprocess.run(["slither", "--version"], capture_output=True, check=True)
-        elif tool_name == "mythril":
-            subprocess.run(["myth", "--version"], capture_output=True, check=True)
-        elif tool_name == "echidna":
-            subprocess.run(["echidna", "--version"], capture_output=True, check=True)
-        elif tool_name == "certora":
-            subprocess.run(["certoraRun", "--version"], capture_output=True, check=True)
-        return True
+        subprocess.run([executable, "--version"], capture_output=True, check=True)
     except (subprocess.CalledProcessError, FileNotFoundError):
         return False
+    return True
+
+
+def json_loads(data: bytes):
+    """Decode JSON bytes, using orjson when available and stdlib json otherwise"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _kill_process_group(process: subprocess.Popen):
+    """
+    Kill a process started with start_new_session=True along with every
+    descendant, so no grandchild keeps its output pipe open after a timeout.
+    """
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except OSError:
+        pass  # Already exited
+
+
+def parse_report(report, with_filename: bool = False) -> Tuple[Dict, List[Dict]]:
+    """
+    Parse a Slither JSON report, given either the raw bytes or a binary
+    stream, into its top-level status ({"success": ..., "error": ...}) and
+    the slimmed detector results. With ijson the report is parsed
+    incrementally so only the detector results are materialized; otherwise
+    the whole document is decoded and walked. with_filename adds the source
+    file of the first element of each result, for splitting batch reports.
+    """
+    status = {}
+    if IJSON_AVAILABLE:
+        source = io.BytesIO(report) if isinstance(report, bytes) else report
+        
+        def record_status(events):
+            for prefix, event, value in events:
+                if prefix in REPORT_STATUS_FIELDS:
+                    status[prefix] = value
+                yield prefix, event, value
+        
+        detectors = ijson.items(record_status(ijson.parse(source)), "results.detectors.item")
+    else:
+        if not isinstance(report, bytes):
+            report = report.read()
+        document = json_loads(report)
+        if not isinstance(document, dict):
+            raise ValueError("Slither report is not a JSON object")
+        status = {field: document[field] for field in REPORT_STATUS_FIELDS if field in document}
+        detectors = document.get("results", {}).get("detectors", [])
+    
+    findings = []
+    for issue in detectors:
+        finding = {field: issue[field] for field in FINDING_FIELDS if field in issue}
+        if with_filename:
+            elements = issue.get("elements") or [{}]
+            finding["filename"] = elements[0].get("source_mapping", {}).get("filename_short")
+        findings.append(finding)
+    return status, findings
+
+
+def json_dumps(obj) -> bytes:
+    """Encode a report as indented JSON bytes, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
+
+def json_dumps_line(obj) -> bytes:
+    """Encode a record as a single NDJSON line"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj) + b"\n"
+    return json.dumps(obj).encode() + b"\n"
+
+
+def findings_file(findings_dir: str, contract_path: str, tool_name: str) -> str:
+    """
+    Sidecar NDJSON path for one tool's findings on one contract. The
+    flattened path keeps the name readable; a short hash of the absolute path
+    keeps contracts like a/b.sol and a_b.sol from sharing a file.
+    """
+    stem = os.path.splitext(os.path.normpath(contract_path))[0]
+    # Leading separators and dots ("/", "../", a bare ".") would otherwise
+    # produce hidden or odd-looking names
+    name = stem.replace(os.sep, "_").lstrip("._") or "contracts"
+    digest = hashlib.sha256(os.path.abspath(contract_path).encode()).hexdigest()[:8]
+    return os.path.join(findings_dir, f"{name}.{digest}.{tool_name}.ndjson")
+
+
+def write_findings(findings: List[Dict], findings_path: str):
+    """
+    Write findings as NDJSON via a temp file and rename it into place, so a
+    failed write never truncates or half-writes an existing findings file.
+    """
+    directory = os.path.dirname(findings_path) or "."
+    with tempfile.NamedTemporaryFile("wb", dir=directory, suffix=".tmp", delete=False) as f:
+        for issue in findings:
+            f.write(json_dumps_line(issue))
+    try:
+        os.replace(f.name, findings_path)
+    except OSError:
+        os.unlink(f.name)
+        raise
+
+
+def _cache_file(directory: Path, *key_parts: str) -> Path:
+    """Map a cache key to a file path inside the cache directory"""
+    digest = hashlib.sha256(":".join(key_parts).encode()).hexdigest()
+    return directory / f"{digest}.json"
+
+
+def _read_cache(cache_file: Path, ttl: float) -> Optional[Dict]:
+    """Return the cached payload if present and younger than ttl seconds"""
+    try:
+        with open(cache_file) as f:
+            entry = json.load(f)
+        if time.time() - entry["timestamp"] < ttl:
+            return entry["data"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def _write_cache(cache_file: Path, data: Dict):
+    """Store a payload with the current timestamp; cache failures are non-fatal"""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # A unique temp file per writer so concurrent processes don't collide
+        with tempfile.NamedTemporaryFile(
+            "w", dir=cache_file.parent, suffix=".tmp", delete=False
+        ) as f:
+            json.dump({"timestamp": time.time(), "data": data}, f)
+        try:
+            os.replace(f.name, cache_file)
+        except OSError:
+            os.unlink(f.name)
+            raise
+    except OSError as e:
+        Logger.error(f"Could not write cache file {cache_file}: {str(e)}")
+
+
+def source_verification(data: Dict) -> Dict:
+    """
+    Reduce a getsourcecode response to its status and whether the contract is
+    verified, dropping the source code and ABI, which can run to megabytes
+    """
+    result = data.get("result")
+    if isinstance(result, list):
+        result = result[0] if result else {}
+    verified = isinstance(result, dict) and bool(result.get("SourceCode"))
+    return {"status": data.get("status"), "verified": verified}
+
+
+def cached_etherscan_get(url: str, module: str, action: str, address: str,
+                         slim: Optional[Callable[[Dict], Dict]] = None) -> Dict:
+    """
+    GET an Etherscan endpoint, serving repeat lookups from the on-disk cache.
+    Only successful responses are cached so rate-limit or error payloads are
+    retried on the next call. slim, when given, reduces the response to the
+    fields the caller uses before it is cached and returned.
+    """
+    key_parts = [module, action, address.lower()]
+    if slim is not None:
+        key_parts.append(slim.__name__)
+    cache_file = _cache_file(ETHERSCAN_CACHE_DIR, *key_parts)
+    cached = _read_cache(cache_file, ETHERSCAN_CACHE_TTL.get(action, 5 * 60))
+    if cached is not None:
+        return cached
+    
+    data = json_loads(_SESSION.get(url, timeout=10).content)
+    if slim is not None:
+        data = slim(data)
+    if data.get("status") == "1":
+        _write_cache(cache_file, data)
+    return data
+
+
+def fetch_coingecko_price(token_id: str) -> Dict:
+    """
+    Fetch USD price, market cap and 24h volume for a CoinGecko token id.
+    Responses are cached for five minutes so repeated audits don't run into
+    CoinGecko's rate limits. Returns an empty dict when the lookup fails.
+    """
+    # CoinGecko ids are lowercase; normalise once so the cache key, URL and
+    # response lookup always agree
+    token_id = token_id.strip().lower()
+    cache_file = _cache_file(COINGECKO_CACHE_DIR, "simple_price", token_id)
+    cached = _read_cache(cache_file, COINGECKO_CACHE_TTL)
+    if cached is not None:
+        return cached
+    
+    if not REQUESTS_AVAILABLE:
+        Logger.error("requests library not installed. Install with: pip install requests")
+        return {}
+    
+    # Passed as params so requests URL-encodes the user-supplied id
+    params = {
+        "ids": token_id,
+        "vs_currencies": "usd",
+        "include_market_cap": "true",
+        "include_24hr_vol": "true",
+    }
+    try:
+        response = _SESSION.get(f"{COINGECKO_API}/simple/price", params=params, timeout=10)
+        data = json_loads(response.content)
+    except requests.RequestException as e:
+        Logger.error(f"CoinGecko API error: {str(e)}")
+        return {}
+    except ValueError as e:
+        Logger.error(f"Unexpected CoinGecko response: {str(e)}")
+        return {}
+    
+    price = data.get(token_id) if isinstance(data, dict) else None
+    if not isinstance(price, dict) or not price:
+        Logger.error(f"CoinGecko has no price data for token id: {token_id}")
+        return {}
+    
+    _write_cache(cache_file, price)
+    return price
 
 
 def validate_contract_path(contract_path: str) -> bool:
     """Ensure the Solidity contract file exists and is readable"""
-    if not os.path.exists(contract_path):
+    try:
+        st = os.stat(contract_path)
+    except FileNotFoundError:
         Logger.error(f"Contract file not found: {contract_path}")
         return False
+    except OSError as e:
+        Logger.error(f"Cannot access contract file {contract_path}: {e.strerror}")
+        return False
+    if not stat.S_ISREG(st.st_mode):
+        Logger.error(f"Contract path is not a regular file: {contract_path}")
+        return False
     if not contract_path.endswith(".sol"):
         Logger.error(f"Contract must be a Solidity file (.sol): {contract_path}")
         return False
+    if not os.access(contract_path, os.R_OK):
+        Logger.error(f"Contract file is not readable: {contract_path}")
+        return False
     return True
 
 
@@ -133,84 +560,218 @@ class SlitherAnalyzer:
     """Static analysis tool for detecting common vulnerabilities"""
     
     @staticmethod
-    def run(contract_path: str) -> AuditResult:
+    def run(contract_path: str, gate_only: bool = False,
+            findings_path: Optional[str] = None) -> AuditResult:
         """
         Run Slither static analysis on a contract. Slither quickly identifies
         common patterns like reentrancy, uninitialized storage, and shadowed
         variables without needing to execute the code.
+        
+        With gate_only the caller only needs the pass/fail decision: a report
+        with no high-impact marker anywhere in its bytes is passed without
+        being parsed. Such results are marked gated, with empty severity
+        counts and no findings count, so they can't be read as a clean report.
+        
+        Findings are written to findings_path as NDJSON when given; only their
+        count is kept on the returned AuditResult.
         """
         Logger.info("Running Slither static analysis...")
-        start_time = datetime.now()
         
         try:
-            result = subprocess.run(
-                ["slither", contract_path, "--json"],
-                capture_output=True,
-                text=True,
-                timeout=300
-            )
-            
-            if result.returncode == 0:
-                findings = json.loads(result.stdout)
-                severity_count = {
-                    "critical": 0,
-                    "high": 0,
-                    "medium": 0,
-                    "low": 0,
-                    "informational": 0
-                }
-                
-                for issue in findings.get("results", {}).get("detections", []):
-                    severity = issue.get("severity", "informational").lower()
-                    if severity in severity_count:
-                        severity_count[severity] += 1
-                
-                execution_time = (datetime.now() - start_time).total_seconds()
-                passed = severity_count["critical"] == 0 and severity_count["high"] == 0
-                
-                return AuditResult(
-                    tool_name="Slither",
-                    severity_count=severity_count,
-                    findings=findings.get("results", {}).get("detections", []),
-                    execution_time=execution_time,
-                    passed=passed
-                )
-            else:
-                Logger.error(f"Slither failed with error: {result.stderr}")
-                return AuditResult(
-                    tool_name="Slither",
-                    severity_count={},
-                    findings=[],
-                    execution_time=0,
-                    passed=False
-                )
+            findings, error, execution_time = SlitherAnalyzer.execute(contract_path, gate_only)
         except Exception as e:
             Logger.error(f"Slither execution error: {str(e)}")
-            return AuditResult(
-                tool_name="Slither",
-                severity_count={},
-                findings=[],
-                execution_time=0,
-                passed=False
-            )
+            return SlitherAnalyzer.failed_result()
+        
+        if error is not None:
+            Logger.error(f"Slither failed with error: {error}")
+            return SlitherAnalyzer.failed_result()
+        
+        if findings is None:
+            return SlitherAnalyzer.gated_result(execution_time)
+        
+        return SlitherAnalyzer.summarize(findings, execution_time, findings_path)
+    
+    @staticmethod
+    def execute(target: str, gate_only: bool = False,
+                with_filename: bool = False) -> Tuple[Optional[List[Dict]], Optional[str], float]:
+        """
+        Launch Slither on a contract file or directory and stream its report.
+        
+        Returns:
+            (findings, error, execution_time) where findings is None when the
+            gate_only shortcut passed the report unparsed, and error holds
+            the exit code plus the report's error or stderr (and any report
+            parse error) when the analysis failed
+        """
+        start_time = time.perf_counter()
+        
+        with tempfile.TemporaryFile() as stderr_file, subprocess.Popen(
+            ["slither", target, "--json", "-"],
+            stdout=subprocess.PIPE,
+            stderr=stderr_file,
+            start_new_session=True
+        ) as process:
+            # Enforce the timeout even while blocked reading the stream
+            watchdog = threading.Timer(SLITHER_TIMEOUT, _kill_process_group, (process,))
+            watchdog.start()
+            try:
+                # The gate needs the raw bytes; otherwise findings are
+                # parsed straight off the pipe without buffering the report
+                report = process.stdout.read() if gate_only else process.stdout
+                gate_passed = (
+                    gate_only
+                    and report.lstrip().startswith(REPORT_SUCCESS_PREFIXES)
+                    and not any(marker in report for marker in SEVERITY_GATE_MARKERS)
+                )
+                
+                findings = None
+                status = {}
+                parse_error = None
+                if not gate_passed:
+                    try:
+                        status, findings = parse_report(report, with_filename)
+                    except JSON_PARSE_ERRORS as e:
+                        parse_error = e
+                
+                # Drain anything after the findings so Slither can exit
+                while process.stdout.read(STREAM_CHUNK_SIZE):
+                    pass
+                returncode = process.wait()
+            finally:
+                watchdog.cancel()
+            
+            execution_time = time.perf_counter() - start_time
+            if execution_time >= SLITHER_TIMEOUT:
+                raise subprocess.TimeoutExpired(process.args, SLITHER_TIMEOUT)
+            
+            # Slither exits non-zero whenever it reports findings, so the
+            # report's own success flag decides; the exit code only matters
+            # when no valid report was produced
+            success = status.get("success")
+            if success is None and parse_error is None:
+                success = returncode == 0
+            if gate_passed or success is True:
+                return findings, None, execution_time
+            
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode(errors="replace").strip()
+            detail = (status.get("error") if success is False else None) or stderr
+            error = f"exit code {returncode}"
+            if detail:
+                error += f": {detail}"
+            if parse_error is not None:
+                error += f" (report parse error: {str(parse_error).strip()})"
+            return None, error, execution_time
+    
+    @staticmethod
+    def summarize(findings: List[Dict], execution_time: float,
+                  findings_path: Optional[str] = None) -> AuditResult:
+        """
+        Count findings by impact and build the tool's AuditResult. Findings
+        are written to findings_path when given and are never retained on
+        the result, so memory stays flat across long batch runs.
+        """
+        counts = Counter(
+            IMPACT_SEVERITY.get(str(issue.get("impact", "")).lower(), "informational")
+            for issue in findings
+        )
+        severity_count = {severity: counts.get(severity, 0) for severity in SEVERITY_LEVELS}
+        
+        if findings_path is not None:
+            try:
+                write_findings(findings, findings_path)
+            except OSError as e:
+                Logger.error(f"Could not write findings file {findings_path}: {str(e)}")
+                findings_path = None
+        
+        passed = severity_count["critical"] == 0 and severity_count["high"] == 0
+        
+        return AuditResult(
+            tool_name="Slither",
+            severity_count=severity_count,
+            findings_count=len(findings),
+            execution_time=execution_time,
+            passed=passed,
+            findings_path=findings_path
+        )
+    
+    @staticmethod
+    def gated_result(execution_time: float) -> AuditResult:
+        """AuditResult reported when the QUICK gate passed a report unparsed"""
+        return AuditResult(
+            tool_name="Slither",
+            severity_count={},
+            findings_count=None,
+            execution_time=execution_time,
+            passed=True,
+            gated=True
+        )
+    
+    @staticmethod
+    def failed_result() -> AuditResult:
+        """AuditResult reported when Slither could not produce a report"""
+        return AuditResult(
+            tool_name="Slither",
+            severity_count={},
+            findings_count=0,
+            execution_time=0,
+            passed=False
+        )
+
+
+# Analyzer registry: (tool name, entry point, audit levels that run it).
+# Every entry point takes the contract path plus gate_only (set for QUICK audits,
+# where only pass/fail matters) and findings_path (NDJSON output file, or None)
+# keyword arguments and returns an AuditResult.
+AUDIT_TOOLS: List[Tuple[str, Callable[..., AuditResult], Tuple[AuditLevel, ...]]] = [
+    ("slither", SlitherAnalyzer.run,
+     (AuditLevel.QUICK, AuditLevel.STANDARD, AuditLevel.DEEP, AuditLevel.FORENSIC)),
+]
+
+
+def result_summary(result: AuditResult) -> Dict:
+    """Report entry for a single tool result (findings are not embedded)"""
+    return {
+        "tool": result.tool_name,
+        "passed": result.passed,
+        "severity_count": result.severity_count,
+        "execution_time": result.execution_time,
+        "findings_count": result.findings_count,
+        "findings_path": result.findings_path,
+        "gated": result.gated
+    }
 
 
 class AuditPipeline:
     """Main audit orchestration class"""
     
-    def __init__(self, contract_path: str, audit_level: AuditLevel):
+    def __init__(self, contract_path: str, audit_level: AuditLevel,
+                 strict_version_check: bool = False,
+                 skip_verification_check: bool = False,
+                 findings_dir: Optional[str] = None):
         self.contract_path = contract_path
         self.audit_level = audit_level
+        self.strict_version_check = strict_version_check
+        self.findings_dir = findings_dir
+        # Verification status is display-only, so only deeper audits pay for the lookup
+        self.verification_needed = (
+            audit_level in (AuditLevel.DEEP, AuditLevel.FORENSIC)
+            and not skip_verification_check
+        )
         self.results: List[AuditResult] = []
         self.metadata: Dict = {}
     
-    def fetch_etherscan_data(self, contract_address: Optional[str] = None) -> Dict:
+    def fetch_etherscan_data(self, contract_address: Optional[str] = None,
+                             include_verification: bool = True) -> Dict:
         """
         Fetch real on-chain data from Etherscan API when API key is configured.
         Falls back to simulated data for backward compatibility.
         
         Args:
             contract_address: Ethereum contract address (0x...)
+            include_verification: Also query the source code endpoint for the
+                verification status; when False it is reported as "not_checked"
             
         Returns:
             Dictionary containing on-chain metrics or simulated data
@@ -239,9 +800,7 @@ class AuditPipeline:
             }
         
         # Make real API calls
-        try:
-            import requests
-        except ImportError:
+        if not REQUESTS_AVAILABLE:
             Logger.error("requests library not installed. Install with: pip install requests")
             return {
                 "error": "requests library not available",
@@ -251,49 +810,85 @@ class AuditPipeline:
         Logger.info(f"Fetching real on-chain data for {contract_address}...")
         
         try:
-            # API call 1: Get transaction list to find deployer and transaction count
-            tx_url = f"{ETHERSCAN_API}?module=account&action=txlist&address={contract_address}&startblock=0&endblock=99999999&sort=asc&apikey={api_key}"
+            # API call 1: Get the creation record (deployer, tx hash) in one small response
+            creation_url = (
+                f"{ETHERSCAN_API}?module=contract&action=getcontractcreation"
+                f"&contractaddresses={contract_address}&apikey={api_key}"
+            )
             
-            tx_response = requests.get(tx_url, timeout=10)
-            tx_data = tx_response.json()
+            # API call 2: Get only the oldest transaction (existence + timestamp
+            # fallback). Etherscan has no cheap count endpoint, and a full txlist
+            # is unbounded and capped at 10k rows anyway, so no count is fetched.
+            tx_url = (
+                f"{ETHERSCAN_API}?module=account&action=txlist&address={contract_address}"
+                f"&page=1&offset=1&sort=asc&apikey={api_key}"
+            )
             
-            # API call 2: Get source code to check verification status
+            # API call 3: Get source code to check verification status
             source_url = f"{ETHERSCAN_API}?module=contract&action=getsourcecode&address={contract_address}&apikey={api_key}"
             
-            source_response = requests.get(source_url, timeout=10)
-            source_data = source_response.json()
+            # The lookups are independent, so overlap their round-trips
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                creation_future = executor.submit(
+                    cached_etherscan_get, creation_url,
+                    "contract", "getcontractcreation", contract_address
+                )
+                tx_future = executor.submit(
+                    cached_etherscan_get, tx_url, "account", "txlist", contract_address
+                )
+                source_future = None
+                if include_verification:
+                    source_future = executor.submit(
+                        cached_etherscan_get, source_url,
+                        "contract", "getsourcecode", contract_address,
+                        slim=source_verification
+                    )
+                creation_data = creation_future.result()
+                tx_data = tx_future.result()
+                source_data = source_future.result() if source_future else {}
             
             # Parse responses
-            transaction_count = 0
+            has_transactions = False
             deployer_address = "Unknown"
+            creation_tx_hash = "Unknown"
             creation_date = "Unknown"
+            creation_timestamp = None
+            
+            if creation_data.get("status") == "1" and creation_data.get("result"):
+                creation = creation_data["result"][0]
+                deployer_address = creation.get("contractCreator", "Unknown")
+                creation_tx_hash = creation.get("txHash", "Unknown")
+                creation_timestamp = creation.get("timestamp")
             
             if tx_data.get("status") == "1" and tx_data.get("result"):
-                transactions = tx_data["result"]
-                transaction_count = len(transactions)
+                has_transactions = True
                 
-                # Find the contract creation transaction (where 'to' is empty)
-                for tx in transactions:
-                    if tx.get("to") == "":
-                        deployer_address = tx.get("from", "Unknown")
-                        timestamp = int(tx.get("timeStamp", 0))
-                        creation_date = datetime.fromtimestamp(timestamp).isoformat()
-                        break
+                # Older API responses omit the creation timestamp; with ascending
+                # sort the creation transaction, if listed, is the first entry
+                first_tx = tx_data["result"][0]
+                if creation_timestamp is None and first_tx.get("hash") == creation_tx_hash:
+                    creation_timestamp = first_tx.get("timeStamp")
+            
+            # Convert once, in UTC, so no local timezone lookup is needed
+            if creation_timestamp is not None:
+                creation_date = datetime.fromtimestamp(
+                    int(creation_timestamp), timezone.utc
+                ).strftime("%Y-%m-%dT%H:%M:%SZ")
             
             # Check verification status
-            verification_status = "not_verified"
-            if source_data.get("status") == "1" and source_data.get("result"):
-                result = source_data["result"][0] if isinstance(source_data["result"], list) else source_data["result"]
-                if result.get("SourceCode"):
-                    verification_status = "verified"
+            verification_status = "not_verified" if include_verification else "not_checked"
+            if source_data.get("status") == "1" and source_data.get("verified"):
+                verification_status = "verified"
             
             return {
                 "contract_address": contract_address,
                 "verification_status": verification_status,
-                "transaction_count": transaction_count,
+                "transaction_count": None,  # Not available without downloading full history
+                "has_transactions": has_transactions,
                 "deployer_address": deployer_address,
+                "creation_tx_hash": creation_tx_hash,
                 "creation_date": creation_date,
-                "api_endpoint": tx_url.replace(api_key, "***")  # Don't expose API key
+                "api_endpoint": creation_url.replace(api_key, "***")  # Don't expose API key
             }
             
         except requests.RequestException as e:
@@ -309,6 +904,21 @@ class AuditPipeline:
                 "contract_address": contract_address
             }
     
+    def build_crypto_metrics(self, token_id: str, price_data: Dict,
+                             etherscan_data: Dict) -> CryptoMetrics:
+        """Combine CoinGecko market data with on-chain Etherscan data"""
+        return CryptoMetrics(
+            token_name=token_id,
+            current_price=price_data.get("usd", 0.0),
+            market_cap=price_data.get("usd_market_cap", 0.0),
+            volume_24h=price_data.get("usd_24h_vol", 0.0),
+            holder_count=0,  # Not available from the free APIs used here
+            contract_address=etherscan_data.get("contract_address", "Unknown"),
+            deployer_address=etherscan_data.get("deployer_address", "Unknown"),
+            creation_date=etherscan_data.get("creation_date", "Unknown"),
+            transaction_count=etherscan_data.get("transaction_count")
+        )
+    
     def run_audit(self) -> Dict:
         """Execute the audit pipeline based on the configured level"""
         Logger.info(f"Starting {self.audit_level.value} audit of {self.contract_path}")
@@ -317,83 +927,292 @@ class AuditPipeline:
         if not validate_contract_path(self.contract_path):
             return {"error": "Invalid contract path"}
         
-        # Pass contract address from metadata if available
+        # Select the installed tools for this audit level
+        tools = []
+        for tool_name, runner, levels in AUDIT_TOOLS:
+            if self.audit_level not in levels:
+                continue
+            if check_tool_installed(tool_name, strict=self.strict_version_check):
+                tools.append((tool_name, runner))
+            else:
+                Logger.error(f"{tool_name.capitalize()} not installed")
+        
+        # Tools are subprocess-bound and the Etherscan lookup is network-bound,
+        # so run them all concurrently: wall time is the slowest task, not the sum.
         contract_address = self.metadata.get("contract_address")
-        self.metadata["etherscan_data"] = self.fetch_etherscan_data(contract_address)
+        token_id = self.metadata.get("token_id")
+        if token_id:
+            # CoinGecko ids are lowercase; report the id that was actually queried
+            token_id = self.metadata["token_id"] = token_id.strip().lower()
+        # The QUICK gate skips parsing clean reports, so it can't be used when
+        # the caller asked for every finding to be written out
+        gate_only = self.audit_level == AuditLevel.QUICK and not self.findings_dir
+        if self.findings_dir:
+            os.makedirs(self.findings_dir, exist_ok=True)
         
-        # Run tools based on audit level
-        if self.audit_level in [AuditLevel.QUICK, AuditLevel.STANDARD, AuditLevel.DEEP, AuditLevel.FORENSIC]:
-            if check_tool_installed("slither"):
-                result = SlitherAnalyzer.run(self.contract_path)
-                self.results.append(result)
-            else:
-                Logger.error("Slither not installed")
+        with ThreadPoolExecutor(max_workers=len(tools) + 2) as executor:
+            etherscan_future = executor.submit(
+                self.fetch_etherscan_data, contract_address, self.verification_needed
+            )
+            price_future = executor.submit(fetch_coingecko_price, token_id) if token_id else None
+            futures = {}
+            for tool_name, runner in tools:
+                findings_path = None
+                if self.findings_dir:
+                    findings_path = findings_file(self.findings_dir, self.contract_path, tool_name)
+                future = executor.submit(
+                    runner, self.contract_path, gate_only=gate_only, findings_path=findings_path
+                )
+                futures[future] = tool_name
+            
+            # Dicts keep insertion order, so results follow AUDIT_TOOLS order
+            # regardless of which tool finishes first
+            for future in futures:
+                try:
+                    self.results.append(future.result())
+                except Exception as e:
+                    Logger.error(f"{futures[future].capitalize()} execution error: {str(e)}")
+            
+            self.metadata["etherscan_data"] = etherscan_future.result()
+            
+            if price_future:
+                try:
+                    price_data = price_future.result()
+                except Exception as e:
+                    Logger.error(f"Unexpected error fetching CoinGecko data: {str(e)}")
+                    price_data = {}
+                
+                # Don't report zeroed market data as if it were real
+                if price_data:
+                    metrics = self.build_crypto_metrics(
+                        token_id, price_data, self.metadata["etherscan_data"]
+                    )
+                    self.metadata["crypto_metrics"] = asdict(metrics)
+                else:
+                    self.metadata["crypto_metrics"] = {
+                        "error": "CoinGecko price data unavailable",
+                        "token_id": token_id
+                    }
         
         # Compile results
         return {
             "contract": self.contract_path,
             "audit_level": self.audit_level.value,
             "timestamp": datetime.now().isoformat(),
-            "results": [
-                {
-                    "tool": r.tool_name,
-                    "passed": r.passed,
-                    "severity_count": r.severity_count,
-                    "execution_time": r.execution_time
-                }
-                for r in self.results
-            ],
+            "results": [result_summary(r) for r in self.results],
             "metadata": self.metadata
         }
 
 
-def main():
-    """Main entry point for the audit pipeline"""
-    import argparse
+class BatchAuditPipeline:
+    """
+    Audit every contract under a directory with a single Slither invocation,
+    so Slither's startup cost is paid once rather than once per contract.
+    Findings are split back into per-contract results by source file.
+    """
     
+    def __init__(self, contracts_dir: str, strict_version_check: bool = False,
+                 findings_dir: Optional[str] = None):
+        self.contracts_dir = contracts_dir
+        self.strict_version_check = strict_version_check
+        self.findings_dir = findings_dir
+        self.results: List[AuditResult] = []
+        self.contract_results: Dict[str, AuditResult] = {}
+    
+    def find_contracts(self) -> List[str]:
+        """List the Solidity files under the contracts directory"""
+        contracts = []
+        for dirpath, _, filenames in os.walk(self.contracts_dir):
+            for filename in filenames:
+                if filename.endswith(".sol"):
+                    contracts.append(os.path.join(dirpath, filename))
+        return sorted(contracts)
+    
+    def run_audit(self) -> Dict:
+        """Run Slither once over the directory and report per-contract results"""
+        Logger.info(f"Starting batch audit of {self.contracts_dir}")
+        
+        if not os.path.isdir(self.contracts_dir):
+            Logger.error(f"Contracts directory not found: {self.contracts_dir}")
+            return {"error": "Invalid contracts directory"}
+        
+        contracts = self.find_contracts()
+        if not contracts:
+            Logger.error(f"No Solidity files (.sol) found in {self.contracts_dir}")
+            return {"error": "No contracts found"}
+        
+        # Every result needs its own findings file, or one contract's
+        # findings would silently replace another's
+        if self.findings_dir:
+            targets = contracts + [self.contracts_dir]
+            paths = [findings_file(self.findings_dir, t, "slither") for t in targets]
+            if len(set(paths)) != len(paths):
+                Logger.error(
+                    f"Contracts under {self.contracts_dir} map to duplicate findings files"
+                )
+                return {"error": "Duplicate findings files"}
+        
+        if not check_tool_installed("slither", strict=self.strict_version_check):
+            Logger.error("Slither not installed")
+            return {"error": "Slither not installed"}
+        
+        Logger.info(f"Running Slither static analysis on {len(contracts)} contracts...")
+        execution_time = 0.0
+        try:
+            findings, error, execution_time = SlitherAnalyzer.execute(
+                self.contracts_dir, with_filename=True
+            )
+        except Exception as e:
+            findings, error = None, str(e)
+        
+        if error is not None:
+            Logger.error(f"Slither failed with error: {error}")
+            for contract in contracts:
+                self.contract_results[os.path.relpath(contract)] = SlitherAnalyzer.failed_result()
+        else:
+            # Group findings by source file. Findings with no file, or in a
+            # file outside the audited set (an imported library, say), go to
+            # the directory itself
+            by_file: Dict[str, List[Dict]] = {os.path.abspath(c): [] for c in contracts}
+            directory = os.path.abspath(self.contracts_dir)
+            for finding in findings:
+                filename = finding.pop("filename", None)
+                key = os.path.abspath(filename) if filename else directory
+                if key not in by_file:
+                    key = directory
+                by_file.setdefault(key, []).append(finding)
+            
+            # Each contract is charged an equal share of the single run; the
+            # directory bucket is not a contract and is charged nothing
+            share = execution_time / len(contracts)
+            if self.findings_dir:
+                os.makedirs(self.findings_dir, exist_ok=True)
+            
+            for path in list(by_file):
+                contract = os.path.relpath(path)
+                file_findings = by_file.pop(path)
+                findings_path = None
+                if self.findings_dir:
+                    findings_path = findings_file(self.findings_dir, contract, "slither")
+                self.contract_results[contract] = SlitherAnalyzer.summarize(
+                    file_findings, share if path != directory else 0.0, findings_path
+                )
+        
+        self.results = list(self.contract_results.values())
+        
+        return {
+            "contracts_dir": self.contracts_dir,
+            "timestamp": datetime.now().isoformat(),
+            "execution_time": execution_time,
+            "contracts": {
+                contract: [result_summary(result)]
+                for contract, result in self.contract_results.items()
+            }
+        }
+
+
+@functools.lru_cache(maxsize=None)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the CLI parser once and reuse it for repeated invocations"""
     parser = argparse.ArgumentParser(
         description="Smart Contract Audit Pipeline with Etherscan Integration"
     )
-    parser.add_argument(
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument(
         "--contract",
-        required=True,
         help="Path to the Solidity contract file"
     )
+    target.add_argument(
+        "--contracts-dir",
+        help="Directory of Solidity contracts to audit with a single Slither run"
+    )
     parser.add_argument(
         "--level",
-        choices=["quick", "standard", "deep", "forensic"],
-        default="quick",
+        choices=list(_LEVELS),
         help="Audit depth level (default: quick)"
     )
     parser.add_argument(
         "--address",
         help="Contract address on Ethereum mainnet (0x...)"
     )
+    parser.add_argument(
+        "--token-id",
+        help="CoinGecko token id (e.g. tether) to include live market data"
+    )
     parser.add_argument(
         "--output",
         help="Output file for audit report (JSON format)"
     )
+    parser.add_argument(
+        "--findings-dir",
+        help="Directory for per-tool findings files (NDJSON, one finding per line)"
+    )
+    parser.add_argument(
+        "--strict-version-check",
+        action="store_true",
+        help="Launch each tool with --version instead of a PATH lookup to confirm it runs"
+    )
+    parser.add_argument(
+        "--skip-verification-check",
+        action="store_true",
+        help="Skip the Etherscan source verification lookup (already skipped for quick/standard)"
+    )
+    return parser
+
+
+def main():
+    """Main entry point for the audit pipeline"""
+    parser = _build_parser()
     
     args = parser.parse_args()
     
-    # Create pipeline
-    audit_level = AuditLevel(args.level)
-    pipeline = AuditPipeline(args.contract, audit_level)
+    # Batch mode runs Slither only, without on-chain or market lookups
+    if args.contracts_dir:
+        unsupported = [
+            flag for flag, value in (
+                ("--level", args.level),
+                ("--address", args.address),
+                ("--token-id", args.token_id),
+                ("--skip-verification-check", args.skip_verification_check),
+            )
+            if value
+        ]
+        if unsupported:
+            parser.error(f"{', '.join(unsupported)} cannot be used with --contracts-dir")
     
-    # Add contract address to metadata if provided
-    if args.address:
-        pipeline.metadata["contract_address"] = args.address
+    # Create pipeline
+    audit_level = _LEVELS[args.level or "quick"]
+    if args.contracts_dir:
+        pipeline = BatchAuditPipeline(
+            args.contracts_dir,
+            strict_version_check=args.strict_version_check,
+            findings_dir=args.findings_dir
+        )
+    else:
+        pipeline = AuditPipeline(
+            args.contract,
+            audit_level,
+            strict_version_check=args.strict_version_check,
+            skip_verification_check=args.skip_verification_check,
+            findings_dir=args.findings_dir
+        )
+        
+        # Add contract address to metadata if provided
+        if args.address:
+            pipeline.metadata["contract_address"] = args.address
+        if args.token_id:
+            pipeline.metadata["token_id"] = args.token_id
     
     # Run audit
     report = pipeline.run_audit()
     
     # Output results
     if args.output:
-        with open(args.output, 'w') as f:
-            json.dump(report, f, indent=2)
+        with open(args.output, 'wb') as f:
+            f.write(json_dumps(report))
         Logger.success(f"Audit report saved to {args.output}")
     else:
-        print(json.dumps(report, indent=2))
+        print(json_dumps(report).decode())
     
     # Exit code based on results
     if not pipeline.results: